@@ -9,16 +9,20 @@ $ nestbackup restore
 $ nestbackup validate # validates the config
 """
 import argparse
+import asyncio
 import configparser
 import json
 import logging
 import os
+import pickle
 import re
+import shlex
 import smtplib
 import socket
 import ssl
 import subprocess
 import sys
+import tempfile
 from collections import OrderedDict, defaultdict
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
@@ -53,6 +57,8 @@ password=test
 recipients=admin@example.com
 """
 
+_CONFIG_EXAMPLE_BYTES = CONFIG_EXAMPLE_TEMPLATE.encode()
+
 
 logger = logging.getLogger("nestbackup")
 
@@ -62,15 +68,33 @@ ACTION_RESTORE = "restore"
 ACTION_VALIDATE = "validate"
 ACTION_CHOICES = (ACTION_INIT, ACTION_BACKUP, ACTION_RESTORE, ACTION_VALIDATE)
 
+# Matches the operation prefix of `aws s3 sync` output lines, e.g. "upload: ..."
+_SYNC_OP_RE = re.compile(r"(\w+):")
 
-def execute(cmd, **kwargs):
-    popen = subprocess.Popen(
-        cmd, stdout=subprocess.PIPE, universal_newlines=True, shell=True, **kwargs
-    )
-    for stdout_line in iter(popen.stdout.readline, ""):
-        yield stdout_line
-    popen.stdout.close()
-    return_code = popen.wait()
+# Snapshot of the environment, shared by every job and overlaid with the
+# job-specific variables at spawn time instead of copied per job.
+_BASE_ENV = os.environ.copy()
+
+
+# Stream reader buffer for subprocess stdout; a large buffer means fewer
+# wakeups for chatty commands like `aws s3 sync`.
+_STREAM_LIMIT = 1 << 20
+
+
+async def execute(cmd, shell=False, **kwargs):
+    kwargs.setdefault("stdout", asyncio.subprocess.PIPE)
+    kwargs.setdefault("stderr", asyncio.subprocess.DEVNULL)
+    kwargs.setdefault("limit", _STREAM_LIMIT)
+    if shell:
+        # bash instead of /bin/sh: dash does not support `set -o pipefail`
+        proc = await asyncio.create_subprocess_shell(
+            cmd, executable="/bin/bash", **kwargs
+        )
+    else:
+        proc = await asyncio.create_subprocess_exec(*shlex.split(cmd), **kwargs)
+    async for line in proc.stdout:
+        yield line.decode("utf-8", errors="replace")
+    return_code = await proc.wait()
     if return_code:
         raise subprocess.CalledProcessError(return_code, cmd)
 
@@ -85,15 +109,128 @@ class BackupNotFound(Exception):
         super().__init__("Backup not found")
 
 
-class Context(dict):
-    def __getattr__(self, name):
-        return self[name]
+class ConfigSection(dict):
+    """Stand-in for configparser.SectionProxy that survives pickling, with
+    the DEFAULT values already merged in."""
+
+    def __init__(self, name, values):
+        super().__init__(values)
+        self.name = name
+
+
+class BaseContext:
+    """Per-job state with slot-based attribute access.
+
+    Keeps the mapping protocol (`keys`, `get`, `__getitem__`) so command and
+    report templates can be filled from it, and caches that mapping until an
+    attribute is assigned.
+    """
+
+    __slots__ = (
+        "_map",
+        "name",
+        "job",
+        "endpoint_url",
+        "aws_access_key_id",
+        "aws_secret_access_key",
+        "aws_shared_credentials_file",
+        "bucket",
+        "hostname",
+        "remote_path",
+        "s3_bucket_url",
+        "aws_cli",
+        "s3_path",
+    )
+
+    def __init__(self):
+        object.__setattr__(self, "_map", None)
+        for name in self.keys():
+            object.__setattr__(self, name, None)
+
+    @classmethod
+    def from_section(cls, section, all_fields):
+        ctx = cls()
+        for field in all_fields:
+            value = section.get(field)
+            if field == "name" and value is None:
+                value = section.name
+            if field == "hostname" and value is None:
+                value = socket.gethostname()
+            elif field == "aws_cli" and value is None:
+                value = "aws"
+                if ctx.endpoint_url:
+                    value += " --endpoint-url {endpoint_url}"
+                value = value.format_map(ctx.as_map())
+            setattr(ctx, field, value)
+
+        ctx.s3_path = "/".join(
+            [ctx[k] for k in ("hostname", "name", "remote_path") if ctx[k] is not None]
+        )
+        ctx.s3_bucket_url = "s3://{bucket}/{s3_path}".format_map(ctx.as_map())
+        return ctx
 
     def __setattr__(self, name, value):
-        self[name] = value
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_map", None)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
 
-    def __delattr__(self, name):
-        del self[name]
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def keys(self):
+        names = []
+        for klass in reversed(type(self).__mro__):
+            names.extend(
+                name for name in getattr(klass, "__slots__", ()) if name != "_map"
+            )
+        return names
+
+    def as_map(self):
+        if self._map is None:
+            object.__setattr__(
+                self, "_map", {name: getattr(self, name) for name in self.keys()}
+            )
+        return self._map
+
+
+class SyncContext(BaseContext):
+    __slots__ = ("local_path", "aws_extra_args")
+
+
+class DatabaseContext(BaseContext):
+    __slots__ = (
+        "db_uri",
+        "retention",
+        "scheme",
+        "username",
+        "password",
+        "dbname",
+        "su_user",
+        "jobs",
+        "compressor",
+        "decompressor",
+        "compression_ext",
+        # set while running
+        "current_date",
+        "dump_basename",
+        "dump_dirname",
+    )
+
+
+class SMTPContext(BaseContext):
+    __slots__ = (
+        "server",
+        "port",
+        "username",
+        "password",
+        "sender",
+        "recipients",
+        "subject",
+        "ssl",
+        "current_date",
+    )
 
 
 class Report:
@@ -110,22 +247,6 @@ class Report:
         return self._report_list.items()
 
 
-class JobManager:
-    JOB_CLASS_MAP = {}
-
-    @classmethod
-    def register(cls, job_id):
-        def registerer(job_cls):
-            cls.JOB_CLASS_MAP[job_id] = job_cls
-            return job_cls
-
-        return registerer
-
-    @classmethod
-    def get(cls, job_id):
-        return cls.JOB_CLASS_MAP[job_id]
-
-
 class BaseJob:
 
     base_fields = (
@@ -144,90 +265,93 @@ class BaseJob:
 
     fields = tuple()
 
+    context_class = BaseContext
+
     def __init__(self, section):
-        self.context = ctx = Context()
         all_fields = self.base_fields + self.fields
         invalid_fields = set(section.keys()).difference(set(all_fields))
         if invalid_fields:
             raise InvalidConfig(invalid_fields)
-        for field in all_fields:
-            value = section.get(field)
-            if field == "name" and value is None:
-                value = section.name
-            if field == "hostname" and value is None:
-                value = socket.gethostname()
-            elif field == "aws_cli" and value is None:
-                value = "aws"
-                if ctx.endpoint_url:
-                    value += " --endpoint-url {endpoint_url}"
-                value = value.format(**ctx)
-            setattr(ctx, field, value)
+        self.context = self.context_class.from_section(section, all_fields)
 
-        ctx.s3_path = "/".join(
-            [ctx[k] for k in ("hostname", "name", "remote_path") if ctx[k] is not None]
-        )
-        ctx.s3_bucket_url = "s3://{bucket}/{s3_path}".format(**ctx)
-
-        ctx.env = os.environ.copy()
-        ctx.env.update(
-            {
-                "AWS_ACCESS_KEY_ID": ctx.aws_access_key_id,
-                "AWS_SECRET_ACCESS_KEY": ctx.aws_secret_access_key,
-            }
-        )
-
-    def run(self, command):
-        output = ""
-        for line in self.run_stream(command):
-            output += line
-        return output
-
-    def run_stream(self, command):
+    def _build_env(self, extra=None):
+        ctx = self.context
+        env = {
+            **_BASE_ENV,
+            "AWS_ACCESS_KEY_ID": ctx.aws_access_key_id,
+            "AWS_SECRET_ACCESS_KEY": ctx.aws_secret_access_key,
+        }
+        if extra:
+            env.update(extra)
+        return env
+
+    async def run(self, command, shell=False, extra_env=None):
+        lines = []
+        async for line in self.run_stream(command, shell=shell, extra_env=extra_env):
+            lines.append(line)
+        return "".join(lines)
+
+    async def run_discard(self, command, shell=False, extra_env=None):
+        """Like run(), but without retaining the output."""
+        async for _ in self.run_stream(command, shell=shell, extra_env=extra_env):
+            pass
+
+    async def run_stream(self, command, shell=False, extra_env=None):
         logger.debug("Run template: {}".format(command))
-        command = command.format(**self.context)
+        command = command.format_map(self.context.as_map())
         logger.info("Run: {}".format(command))
-        for line in execute(command, env=self.context.env):
+        async for line in execute(command, shell=shell, env=self._build_env(extra_env)):
             logger.info("Output: " + line)
             yield line
 
-    def backup(self):
+    async def backup(self, report):
         raise NotImplemented()
 
-    def restore(self):
+    async def restore(self):
         raise NotImplemented()
 
 
-@JobManager.register("sync")
 class SyncJob(BaseJob):
     fields = ("local_path", "aws_extra_args")
 
+    context_class = SyncContext
+
     def __init__(self, section):
         super().__init__(section)
         ctx = self.context
         if ctx.aws_extra_args is None:
             ctx.aws_extra_args = ''
 
-    def backup(self, report):
+    async def backup(self, report):
         ctx = self.context
         agg_operations = defaultdict(int)
-        for line in self.run_stream("{aws_cli} s3 sync {aws_extra_args} {local_path} {s3_bucket_url}"):
-            if re.match(r"\w+:.*", line):
-                op = line.split(":")[0]
-                agg_operations[op] += 1
+        async for line in self.run_stream("{aws_cli} s3 sync {aws_extra_args} {local_path} {s3_bucket_url}"):
+            match = _SYNC_OP_RE.match(line)
+            if match:
+                agg_operations[match.group(1)] += 1
         report.add(
             ctx.name,
             [
-                "{}: {}".format(op, agg_operations[op])
-                for op in sorted(agg_operations.keys())
+                "{}: {}".format(op, count)
+                for op, count in sorted(agg_operations.items())
             ]
             or ["No files out of sync"],
         )
 
-    def restore(self):
-        self.run("{aws_cli} s3 sync {aws_extra_args} {s3_bucket_url} {local_path}")
+    async def restore(self):
+        await self.run_discard("{aws_cli} s3 sync {aws_extra_args} {s3_bucket_url} {local_path}")
+
+
+# Object name extension per compressor program
+_COMPRESSOR_EXT_MAP = {
+    "gzip": "gz",
+    "pigz": "gz",
+    "zstd": "zst",
+    "xz": "xz",
+    "lz4": "lz4",
+}
 
 
-@JobManager.register("database")
 class DatabaseJob(BaseJob):
     fields = (
         "db_uri",
@@ -238,9 +362,12 @@ class DatabaseJob(BaseJob):
         "password",
         "dbname",
         "su_user",
-        "dump_filename",
+        "jobs",
+        "compressor",
     )
 
+    context_class = DatabaseContext
+
     def __init__(self, section):
         super().__init__(section)
         ctx = self.context
@@ -255,22 +382,36 @@ class DatabaseJob(BaseJob):
             raise InvalidConfig("Unsupported database scheme '{}'".format(ctx.scheme))
         if ctx.retention:
             ctx.retention = int(ctx.retention)
+        ctx.jobs = int(ctx.jobs) if ctx.jobs else os.cpu_count()
+        # zstd matches gzip's ratio at a fraction of the CPU time and -T0
+        # spreads the compression over all cores
+        if ctx.compressor is None:
+            ctx.compressor = "zstd -T0 -3"
+        compressor_prog = ctx.compressor.split()[0]
+        ctx.decompressor = compressor_prog + " -dc"
+        ctx.compression_ext = _COMPRESSOR_EXT_MAP.get(
+            os.path.basename(compressor_prog), os.path.basename(compressor_prog)
+        )
 
     def _get_command(self, action):
+        """Return the client command for `action` and the extra environment
+        variables it needs."""
         ctx = self.context
         param_map = {
             "hostname": "--host",
             "username": "--user",
         }
+        suffix = []
+        extra_env = {}
         if ctx.scheme == "postgresql":
-            cmd = (
-                ["pg_dump"]
-                if action == ACTION_BACKUP
-                else ["psql", "--quiet -o /dev/null"]
-            )
+            if action == ACTION_BACKUP:
+                cmd = ["pg_dump", "--format=directory", "--jobs={jobs}", "--file={dump_dirname}"]
+                param_map["dbname"] = "dbname"
+            else:
+                cmd = ["pg_restore", "--jobs={jobs}", "--dbname={dbname}"]
+                suffix = ["{dump_dirname}"]
             if ctx.password:
-                ctx.env["PGPASSWORD"] = ctx.password
-            param_map["dbname"] = "dbname"
+                extra_env["PGPASSWORD"] = ctx.password
         elif ctx.scheme == "mysql":
             cmd = (
                 ["mysqldump", "--no-tablespaces"]
@@ -285,58 +426,120 @@ class DatabaseJob(BaseJob):
             value = ctx.get(field)
             if value is not None:
                 cmd.append("%s={%s}" % (param, field))
-        result = " ".join(cmd)
+        result = " ".join(cmd + suffix)
         if ctx.su_user:
             result = 'su {} -c"{}"'.format(ctx.su_user, result)
-        return result
+        return result, extra_env
 
-    def backup(self, report):
+    async def backup(self, report):
         ctx = self.context
         ctx.current_date = datetime.now().isoformat()
-        ctx.dump_basename = "{scheme}_{current_date}.sql".format(**ctx)
-        ctx.dump_basename_zip = ctx.dump_basename + ".tar.gz"
-        ctx.dump_filename = "/tmp/{dump_basename}".format(**ctx)
-        ctx.dump_filename_zip = ctx.dump_filename + ".tar.gz"
-        ctx.dump_dirname = os.path.dirname(ctx.dump_filename)
-
-        self.run(self._get_command(ACTION_BACKUP) + " > {dump_filename}")
-        self.run("tar -C {dump_dirname} -zcvf {dump_filename_zip} {dump_basename}")
-        self.run("{aws_cli} s3 cp {dump_filename_zip} {s3_bucket_url}/{dump_basename_zip}")
-        report.add(ctx.name, ["upload: {s3_bucket_url}/{dump_basename_zip}".format(**ctx)])
-        self.run("rm {dump_filename} {dump_filename_zip}")
+
+        if ctx.scheme == "postgresql":
+            # Directory-format dump so pg_dump can parallelize across {jobs}
+            # workers. Its members are already compressed, so the directory
+            # is streamed into S3 as a plain tar.
+            ctx.dump_basename = "{scheme}_{current_date}.pgdump.tar".format_map(ctx)
+            ctx.dump_dirname = "/tmp/{scheme}_{current_date}.pgdump".format_map(ctx)
+            dump_command, extra_env = self._get_command(ACTION_BACKUP)
+            await self.run_discard(dump_command, extra_env=extra_env)
+            try:
+                await self.run_discard(
+                    "set -o pipefail; tar -C /tmp -cf - $(basename {dump_dirname})"
+                    " | {aws_cli} s3 cp - {s3_bucket_url}/{dump_basename}",
+                    shell=True,
+                )
+            finally:
+                await self.run_discard("rm -r {dump_dirname}")
+        else:
+            # Stream the dump straight into S3, so the upload starts
+            # immediately and no temporary file hits the disk. pipefail makes
+            # a failing dump fail the whole pipeline.
+            ctx.dump_basename = "{scheme}_{current_date}.sql.{compression_ext}".format_map(ctx)
+            dump_command, extra_env = self._get_command(ACTION_BACKUP)
+            await self.run_discard(
+                "set -o pipefail; "
+                + dump_command
+                + " | {compressor} -c | {aws_cli} s3 cp - {s3_bucket_url}/{dump_basename}",
+                shell=True,
+                extra_env=extra_env,
+            )
+        report.add(ctx.name, ["upload: {s3_bucket_url}/{dump_basename}".format_map(ctx)])
         if ctx.retention:
-            result = self.run(
-                "{aws_cli} s3api list-objects-v2 --bucket {bucket} --prefix {s3_path}/{scheme}_ --query 'sort_by(Contents, &LastModified)[].Key' --output=json"
+            result = await self.run(
+                "{aws_cli} s3api list-objects-v2 --bucket {bucket} --prefix {s3_path}/{scheme}_ --query 'Contents[].Key' --output=text"
             )
-            target_file_list = json.loads(result)
+            # text output is whitespace-separated keys, or "None" when empty.
+            # The keys embed the dump's isoformat date, so a lexicographic
+            # sort is a chronological one without the JMESPath sort_by pass.
+            target_file_list = sorted(key for key in result.split() if key != "None")
             if len(target_file_list) > ctx.retention:
-                for filename in target_file_list[: -ctx.retention]:
-                    self.run("{aws_cli} s3 rm s3://{bucket}/" + filename)
-                    report.add(
-                        ctx.name, ["delete: s3://{bucket}/".format(**ctx) + filename]
+                delete_file_list = target_file_list[: -ctx.retention]
+                # delete-objects accepts at most 1000 keys per call
+                for start in range(0, len(delete_file_list), 1000):
+                    payload = json.dumps(
+                        {
+                            "Objects": [
+                                {"Key": key}
+                                for key in delete_file_list[start : start + 1000]
+                            ],
+                            "Quiet": True,
+                        }
                     )
-
-    def restore(self):
+                    with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+                        f.write(payload)
+                        f.flush()
+                        await self.run_discard(
+                            "{aws_cli} s3api delete-objects --bucket {bucket}"
+                            " --delete file://" + f.name
+                        )
+                report.add(
+                    ctx.name,
+                    [
+                        "delete: s3://{bucket}/".format_map(ctx) + filename
+                        for filename in delete_file_list
+                    ],
+                )
+
+    async def restore(self):
         ctx = self.context
-        result = self.run(
-            "{aws_cli} s3api list-objects-v2 --bucket {bucket} --prefix {s3_path}/{scheme}_ --query 'sort_by(Contents, &LastModified)[-1].Key' --output=json",
+        result = await self.run(
+            "{aws_cli} s3api list-objects-v2 --bucket {bucket} --prefix {s3_path}/{scheme}_ --query 'Contents[].Key' --output=text",
         )
-        target_file = json.loads(result)
-        if target_file:
-            ctx.dump_basename = os.path.basename(target_file)
-            ctx.dump_filename = "/tmp/" + ctx.dump_basename
-            ctx.dump_filename_zip = ctx.dump_filename + ".tar.gz"
+        # the keys embed the dump's isoformat date, so the lexicographic max
+        # is the most recent backup
+        target_file_list = [key for key in result.split() if key != "None"]
+        if target_file_list:
+            ctx.dump_basename = os.path.basename(max(target_file_list))
         else:
             raise BackupNotFound()
-        self.run("{aws_cli} s3 cp {s3_bucket_url}/{dump_basename} {dump_filename_zip}")
-        ctx.dump_filename = self.run(
-            "tar --force-local -zvxf {dump_filename_zip}"
-        ).strip("\n")
-        self.run(self._get_command(ACTION_RESTORE) + " < {dump_filename}")
-        self.run("rm {dump_filename} {dump_filename_zip}")
+        if ctx.scheme == "postgresql":
+            ctx.dump_dirname = "/tmp/" + ctx.dump_basename[: -len(".tar")]
+            await self.run_discard(
+                "set -o pipefail; {aws_cli} s3 cp {s3_bucket_url}/{dump_basename} -"
+                " | tar -C /tmp -xf -",
+                shell=True,
+            )
+            restore_command, extra_env = self._get_command(ACTION_RESTORE)
+            try:
+                await self.run_discard(restore_command, extra_env=extra_env)
+            finally:
+                await self.run_discard("rm -r {dump_dirname}")
+        else:
+            restore_command, extra_env = self._get_command(ACTION_RESTORE)
+            await self.run_discard(
+                "set -o pipefail; {aws_cli} s3 cp {s3_bucket_url}/{dump_basename} - | {decompressor} | "
+                + restore_command,
+                shell=True,
+                extra_env=extra_env,
+            )
+
+
+# Open SMTP connections, keyed by (server, port, ssl, username) so repeated
+# sends reuse the TLS handshake and AUTH. Closed at the end of the run.
+_SMTP_POOL = {}
 
 
-@JobManager.register("smtp")
 class SMTPJob(BaseJob):
     fields = (
         "server",
@@ -349,6 +552,8 @@ class SMTPJob(BaseJob):
         "ssl",
     )
 
+    context_class = SMTPContext
+
     def __init__(self, section):
         super().__init__(section)
         ctx = self.context
@@ -358,48 +563,58 @@ class SMTPJob(BaseJob):
             ctx.subject = "Backup report: " + ctx.hostname
         ctx.current_date = datetime.now().ctime()
 
-    def backup(self, report):
+    async def backup(self, report):
         ctx = self.context
-        title = "Backup report for {hostname}: {result}".format(
-            result="Error" if report.error else "Success", **ctx
+        title = "Backup report for {}: {}".format(
+            ctx.hostname, "Error" if report.error else "Success"
         )
         li_item = "<p>{}</p>"
-        body = """\
-            <h1>{title}</h1>
-            <p>{current_date}</p>
-        """.format(
-            title=title, **ctx
-        )
+        html_body = """\
+            <h1>{}</h1>
+            <p>{}</p>
+        """.format(title, ctx.current_date)
+        text_body = "{}\n{}\n".format(title, ctx.current_date)
         for section, items in report.items():
-            body += "<h2><pre>{}</pre></h2>".format(section)
-            body += "\n".join(li_item.format(item) for item in items)
+            html_body += "<h2><pre>{}</pre></h2>".format(section)
+            html_body += "\n".join(li_item.format(item) for item in items)
+            text_body += "\n{}\n".format(section) + "\n".join(items) + "\n"
 
         msg = MIMEMultipart("alternative")
         msg["Subject"] = title
         msg["From"] = ctx.sender
         msg["To"] = ctx.recipients
-        mime_text_body = MIMEText(
-            re.sub("<[^<]+?>", "", re.sub("</[^<]+?>", "\n", body)), "text"
-        )  # cries in xml
-        mime_html_body = MIMEText(body, "html")
+        mime_text_body = MIMEText(text_body, "text")
+        mime_html_body = MIMEText(html_body, "html")
         msg.attach(mime_text_body)
         msg.attach(mime_html_body)
 
         logger.info("Sending report email to {}".format(ctx.recipients))
-        if ctx.ssl:
-            conn = smtplib.SMTP_SSL(
-                ctx.server, port=ctx.port, context=ssl.create_default_context()
-            )
-        else:
-            conn = smtplib.SMTP(ctx.server, port=ctx.port)
-        conn.login(ctx.username, ctx.password)
+        key = (ctx.server, ctx.port, ctx.ssl, ctx.username)
+        conn = _SMTP_POOL.get(key)
+        if conn is None:
+            if ctx.ssl:
+                conn = smtplib.SMTP_SSL(
+                    ctx.server, port=ctx.port, context=ssl.create_default_context()
+                )
+            else:
+                conn = smtplib.SMTP(ctx.server, port=ctx.port)
+            conn.login(ctx.username, ctx.password)
+            _SMTP_POOL[key] = conn
         conn.sendmail(ctx.sender, ctx.recipients.split(","), msg.as_string())
-        conn.quit()
 
-    def restore(self):
+    async def restore(self):
         pass
 
 
+# Job classes by the `job` config field. A plain literal keeps importing the
+# module free of registration side effects and visible to static analysis.
+_JOB_REGISTRY = {
+    "sync": SyncJob,
+    "database": DatabaseJob,
+    "smtp": SMTPJob,
+}
+
+
 class NestBackupCommand:
     def __init__(self, action, force=False):
         self.action = action
@@ -410,15 +625,19 @@ class NestBackupCommand:
 
     def start(self):
         if self.action == ACTION_INIT:
-            if os.path.exists(self.config_filename):
+            try:
+                # O_EXCL+0o600 creates the file atomically with its final
+                # mode, with no window where it exists world-readable
+                fd = os.open(
+                    self.config_filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600
+                )
+            except FileExistsError:
                 logger.error("{} is not empty".format(self.config_filename))
                 sys.exit(1)
-            else:
-                with open(self.config_filename, "w") as f:
-                    f.write(CONFIG_EXAMPLE_TEMPLATE)
-                os.chmod(self.config_filename, 0o600)
-                logger.info("{} created".format(self.config_filename))
-                return
+            os.write(fd, _CONFIG_EXAMPLE_BYTES)
+            os.close(fd)
+            logger.info("{} created".format(self.config_filename))
+            return
         elif self.action == ACTION_RESTORE:
             if not (
                 self.force
@@ -428,34 +647,96 @@ class NestBackupCommand:
                 logger.error("Restore aborted")
                 sys.exit(1)
 
-        config = configparser.ConfigParser()
-        config.read(self.config_filename)
-
         report = Report()
-        for name in config.sections():
-            section = config[name]
-            job_class = JobManager.get(section["job"])
+        jobs = []
+        notify_jobs = []
+        for section in self._load_config():
+            name = section.name
+            job_class = _JOB_REGISTRY.get(section["job"])
             if job_class:
                 job = job_class(section)
-                try:
-                    if self.action == ACTION_BACKUP:
-                        job.backup(report)
-                    elif self.action == ACTION_RESTORE:
-                        job.restore()
-                    elif self.action == ACTION_VALIDATE:
-                        logger.info("Config section '{}' is valid.".format(name))
-                    else:
-                        raise ValueError("Invalid action")
-                except Exception as e:
-                    error_msg = "Error when running {} section: {}".format(name, e)
-                    logger.error(error_msg, exc_info=e)
-                    report.error = True
-                    report.add(name, [error_msg])
+                # SMTP jobs report on the other jobs, so they run serially last
+                if isinstance(job, SMTPJob):
+                    notify_jobs.append((name, job))
+                else:
+                    jobs.append((name, job))
             else:
                 raise InvalidConfig(section["job"])
+
+        if self.action == ACTION_VALIDATE:
+            for name, job in jobs + notify_jobs:
+                logger.info("Config section '{}' is valid.".format(name))
+        else:
+            try:
+                asyncio.run(self._run_jobs(jobs, notify_jobs, report))
+            finally:
+                for conn in _SMTP_POOL.values():
+                    try:
+                        conn.quit()
+                    except smtplib.SMTPException:
+                        pass
+                _SMTP_POOL.clear()
         if report.error:
             sys.exit(1)
 
+    def _load_config(self):
+        """Return the config sections, using a pickled cache next to the
+        config file to skip reparsing when the file has not changed."""
+        stat = os.stat(self.config_filename)
+        cache_filename = os.path.join(
+            os.path.dirname(self.config_filename),
+            "." + os.path.basename(self.config_filename) + ".cache.pkl",
+        )
+        try:
+            with open(cache_filename, "rb") as f:
+                cache = pickle.load(f)
+            if (
+                cache["st_mtime_ns"] == stat.st_mtime_ns
+                and cache["st_size"] == stat.st_size
+            ):
+                return cache["sections"]
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError):
+            pass
+
+        config = configparser.ConfigParser()
+        config.read(self.config_filename)
+        sections = [ConfigSection(name, config[name]) for name in config.sections()]
+        cache = {
+            "st_mtime_ns": stat.st_mtime_ns,
+            "st_size": stat.st_size,
+            "sections": sections,
+        }
+        try:
+            tmp_filename = cache_filename + ".tmp"
+            fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(cache, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_filename, cache_filename)
+        except OSError as e:
+            logger.debug("Could not write config cache: {}".format(e))
+        return sections
+
+    async def _run_jobs(self, jobs, notify_jobs, report):
+        await asyncio.gather(
+            *[self._run_section(name, job, report) for name, job in jobs]
+        )
+        for name, job in notify_jobs:
+            await self._run_section(name, job, report)
+
+    async def _run_section(self, name, job, report):
+        try:
+            if self.action == ACTION_BACKUP:
+                await job.backup(report)
+            elif self.action == ACTION_RESTORE:
+                await job.restore()
+            else:
+                raise ValueError("Invalid action")
+        except Exception as e:
+            error_msg = "Error when running {} section: {}".format(name, e)
+            logger.error(error_msg, exc_info=e)
+            report.error = True
+            report.add(name, [error_msg])
+
 
 def main():
     parser = argparse.ArgumentParser(
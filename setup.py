@@ -17,7 +17,7 @@ DESCRIPTION = 'Backup a server to S3 using a short and simple config file.'
 URL = 'https://github.com/jorgebg/nestbackup'
 EMAIL = 'jorge.barata.gonzalez@gmail.com'
 AUTHOR = 'Jorge Barata'
-REQUIRES_PYTHON = '>=3.6.0'
+REQUIRES_PYTHON = '>=3.7.0'
 VERSION = '0.0.4'
 
 # What packages are required for this module to be executed?
@@ -111,7 +111,7 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: Implementation :: CPython',
         'Programming Language :: Python :: Implementation :: PyPy',
         'Topic :: System :: Archiving :: Backup',